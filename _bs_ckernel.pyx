@@ -0,0 +1,70 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled Black-Scholes kernel
+
+Optional C build of bs_kernel.bs_all, used automatically when present.
+Build it in place with:
+
+    python setup.py build_ext --inplace
+"""
+from libc.math cimport erf, exp, log, sqrt
+
+cdef double SQRT1_2 = 0.7071067811865476      # 1 / sqrt(2)
+cdef double INV_SQRT_2PI = 0.3989422804014327  # 1 / sqrt(2 * pi)
+
+
+cdef inline double _norm_cdf(double x) noexcept nogil:
+    return 0.5 * (1.0 + erf(x * SQRT1_2))
+
+
+cdef void _bs_all(double S, double K, double T, double r, double sigma,
+                  bint is_call, double* out) noexcept nogil:
+    """Fill out[0:6] with (price, delta, gamma, theta, vega, rho)"""
+    cdef double sqrtT, d1, d2, Nd1, Nd2, nd1, disc
+
+    if T <= 0 or sigma <= 0:
+        # At expiry the option is worth its intrinsic value
+        if is_call:
+            out[0] = S - K if S > K else 0.0
+            out[1] = 1.0 if S > K else 0.0
+        else:
+            out[0] = K - S if K > S else 0.0
+            out[1] = -1.0 if S < K else 0.0
+        out[2] = 0.0
+        out[3] = 0.0
+        out[4] = 0.0
+        out[5] = 0.0
+        return
+
+    sqrtT = sqrt(T)
+    d1 = (log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrtT)
+    d2 = d1 - sigma * sqrtT
+    Nd1 = _norm_cdf(d1)
+    Nd2 = _norm_cdf(d2)
+    nd1 = INV_SQRT_2PI * exp(-0.5 * d1 * d1)
+    disc = exp(-r * T)
+
+    out[2] = nd1 / (S * sigma * sqrtT)
+    out[4] = S * nd1 * sqrtT / 100
+    if is_call:
+        out[0] = S * Nd1 - K * disc * Nd2
+        out[1] = Nd1
+        out[3] = (-(S * nd1 * sigma) / (2 * sqrtT) - r * K * disc * Nd2) / 365
+        out[5] = K * T * disc * Nd2 / 100
+    else:
+        out[0] = K * disc * (1 - Nd2) - S * (1 - Nd1)
+        out[1] = Nd1 - 1
+        out[3] = (-(S * nd1 * sigma) / (2 * sqrtT) + r * K * disc * (1 - Nd2)) / 365
+        out[5] = -K * T * disc * (1 - Nd2) / 100
+
+
+def bs_all(double S, double K, double T, double r, double sigma, bint is_call):
+    """
+    Black-Scholes price and Greeks in one pass
+    
+    Returns:
+        tuple: (price, delta, gamma, theta, vega, rho)
+    """
+    cdef double out[6]
+    _bs_all(S, K, T, r, sigma, is_call, out)
+    return out[0], out[1], out[2], out[3], out[4], out[5]
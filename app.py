@@ -2,12 +2,16 @@ import streamlit as st
 import yfinance as yf
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
+from math import ceil, sqrt
+from functools import lru_cache
+from joblib import Memory, expires_after
 import warnings
 
+from bs_kernel import bs_terms, bs_all, bs_chain, bs_greeks_array
+
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
@@ -40,78 +44,77 @@ class BlackScholesCalculator:
         self.r = r
         self.sigma = sigma
         self.option_type = option_type.lower()
+        self._is_call = self.option_type == 'call'
         
-        # Calculate d1 and d2
-        if T > 0 and sigma > 0:
-            self.d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-            self.d2 = self.d1 - sigma * np.sqrt(T)
-        else:
-            self.d1 = 0
-            self.d2 = 0
+        # At expiry (or with no volatility) d1 and d2 are undefined and the
+        # option is worth its intrinsic value
+        self._expired = not (T > 0 and sigma > 0)
+        
+        # Price and every Greek in one kernel pass (compiled when available)
+        self._values = bs_all(S, K, T, r, sigma, self._is_call)
+    
+    @property
+    def d1(self):
+        """d1 term, only computed when read"""
+        return 0 if self._expired else bs_terms(self.S, self.K, self.T, self.r, self.sigma)[0]
+    
+    @property
+    def d2(self):
+        """d2 term, only computed when read"""
+        return 0 if self._expired else bs_terms(self.S, self.K, self.T, self.r, self.sigma)[1]
     
     def option_price(self):
         """Calculate the Black-Scholes option price"""
-        if self.T <= 0:
-            if self.option_type == 'call':
-                return max(0, self.S - self.K)
-            else:
-                return max(0, self.K - self.S)
-        
-        if self.option_type == 'call':
-            price = (self.S * norm.cdf(self.d1) - 
-                    self.K * np.exp(-self.r * self.T) * norm.cdf(self.d2))
-        else:  # put
-            price = (self.K * np.exp(-self.r * self.T) * norm.cdf(-self.d2) - 
-                    self.S * norm.cdf(-self.d1))
-        return price
+        return self._values[0]
     
     def delta(self):
         """Calculate Delta - price sensitivity to underlying price"""
-        if self.T <= 0:
-            if self.option_type == 'call':
-                return 1.0 if self.S > self.K else 0.0
-            else:
-                return -1.0 if self.S < self.K else 0.0
-        
-        if self.option_type == 'call':
-            return norm.cdf(self.d1)
-        else:  # put
-            return norm.cdf(self.d1) - 1
+        return self._values[1]
     
     def gamma(self):
         """Calculate Gamma - rate of change of Delta"""
-        if self.T <= 0 or self.sigma <= 0:
-            return 0
-        return norm.pdf(self.d1) / (self.S * self.sigma * np.sqrt(self.T))
+        return self._values[2]
     
     def theta(self):
         """Calculate Theta - time decay (per day)"""
-        if self.T <= 0:
-            return 0
-        
-        if self.option_type == 'call':
-            theta = (-(self.S * norm.pdf(self.d1) * self.sigma) / (2 * np.sqrt(self.T)) -
-                    self.r * self.K * np.exp(-self.r * self.T) * norm.cdf(self.d2))
-        else:  # put
-            theta = (-(self.S * norm.pdf(self.d1) * self.sigma) / (2 * np.sqrt(self.T)) +
-                    self.r * self.K * np.exp(-self.r * self.T) * norm.cdf(-self.d2))
-        return theta / 365  # Convert to per day
+        return self._values[3]
     
     def vega(self):
         """Calculate Vega - sensitivity to volatility"""
-        if self.T <= 0:
-            return 0
-        return self.S * norm.pdf(self.d1) * np.sqrt(self.T) / 100  # Per 1% change in volatility
+        return self._values[4]  # Per 1% change in volatility
     
     def rho(self):
         """Calculate Rho - sensitivity to interest rate"""
-        if self.T <= 0:
-            return 0
-        
-        if self.option_type == 'call':
-            return self.K * self.T * np.exp(-self.r * self.T) * norm.cdf(self.d2) / 100
-        else:  # put
-            return -self.K * self.T * np.exp(-self.r * self.T) * norm.cdf(-self.d2) / 100
+        return self._values[5]
+
+@lru_cache(maxsize=4096)
+def _bs_all(S, K, T, r, sigma, is_call):
+    """
+    Price an option and compute all Greeks, memoized on the inputs
+    
+    Returns:
+        tuple: (price, delta, gamma, theta, vega, rho)
+    """
+    bs = BlackScholesCalculator(S, K, T, r, sigma, 'call' if is_call else 'put')
+    return (float(bs.option_price()), float(bs.delta()), float(bs.gamma()),
+            float(bs.theta()), float(bs.vega()), float(bs.rho()))
+
+# On-disk cache for Yahoo Finance responses, shared across sessions and restarts
+yf_memory = Memory('.cache_yf', verbose=0)
+
+@yf_memory.cache(cache_validation_callback=expires_after(minutes=5))
+def fetch_ticker_data(ticker):
+    """
+    Fetch quote info and 3 months of daily history in one pass
+    
+    Args:
+        ticker (str): Stock ticker symbol
+    
+    Returns:
+        tuple: (info, hist_3mo)
+    """
+    stock = yf.Ticker(ticker)
+    return stock.info, stock.history(period='3mo')
 
 @st.cache_data(ttl=300)  # Cache for 5 minutes
 def get_stock_data(ticker):
@@ -122,34 +125,34 @@ def get_stock_data(ticker):
         ticker (str): Stock ticker symbol
     
     Returns:
-        tuple: (current_price, volatility, stock_info) or (None, None, None) if error
+        tuple: (current_price, volatility, stock_info, hist_3mo) or
+        (None, None, None, None) if error
     """
     try:
-        # Create yfinance ticker object
-        stock = yf.Ticker(ticker)
+        # Single fetch; the shorter windows are sliced from the 3 month history
+        info, hist_3mo = fetch_ticker_data(ticker)
         
         # Get current stock price
-        info = stock.info
         current_price = info.get('currentPrice') or info.get('regularMarketPrice')
         
         if current_price is None:
             # Try getting from recent data
-            hist = stock.history(period='2d')
-            if hist.empty:
-                return None, None, None
-            current_price = hist['Close'].iloc[-1]
+            if hist_3mo.empty:
+                return None, None, None, None
+            current_price = hist_3mo['Close'].iloc[-1]
         
-        # Get 1 month of historical data for volatility calculation
-        hist_data = stock.history(period='1mo')
-        if hist_data.empty or len(hist_data) < 10:
-            return None, None, None
+        # Last month (~22 trading days) of historical data for volatility calculation
+        # Missing closes are dropped so a single gap cannot turn the volatility into NaN
+        closes = hist_3mo['Close'].tail(22).dropna().to_numpy()
+        if len(closes) < 10:
+            return None, None, None, None
         
-        # Calculate daily returns
-        daily_returns = hist_data['Close'].pct_change().dropna()
+        # Calculate daily log returns
+        daily_returns = np.diff(np.log(closes))
         
         # Calculate annualized volatility
-        daily_volatility = daily_returns.std()
-        annualized_volatility = daily_volatility * np.sqrt(252)  # 252 trading days per year
+        daily_volatility = daily_returns.std(ddof=1)
+        annualized_volatility = daily_volatility * sqrt(252)  # 252 trading days per year
         
         # Get additional stock info
         stock_info = {
@@ -160,18 +163,22 @@ def get_stock_data(ticker):
             'currency': info.get('currency', 'USD')
         }
         
-        return current_price, annualized_volatility, stock_info
+        return current_price, annualized_volatility, stock_info, hist_3mo
         
     except Exception as e:
         st.error(f"Error fetching data for {ticker}: {str(e)}")
-        return None, None, None
+        return None, None, None, None
 
 def create_payoff_diagram(S, K, option_price, option_type, current_price):
     """Create option payoff diagram"""
-    # Create range of stock prices
-    price_range = np.linspace(S * 0.7, S * 1.3, 100)
-    
-    if option_type.lower() == 'call':
+    # The payoff is piecewise linear, so the range ends, the strike and the
+    # break-even point are enough for Plotly to draw it exactly
+    is_call = option_type.lower() == 'call'
+    break_even = K + option_price if is_call else K - option_price
+    price_range = np.array([S * 0.7, S * 1.3] + [x for x in (K, break_even) if S * 0.7 < x < S * 1.3])
+    price_range.sort()
+    
+    if is_call:
         # Call option payoff
         payoff = np.maximum(price_range - K, 0) - option_price
         intrinsic = np.maximum(price_range - K, 0)
@@ -224,17 +231,13 @@ def create_greeks_chart(S, K, T, r, sigma, option_type):
     # Create range of stock prices around current price
     price_range = np.linspace(S * 0.8, S * 1.2, 50)
     
-    deltas = []
-    gammas = []
-    thetas = []
-    vegas = []
-    
-    for price in price_range:
-        bs = BlackScholesCalculator(price, K, T, r, sigma, option_type)
-        deltas.append(bs.delta())
-        gammas.append(bs.gamma())
-        thetas.append(bs.theta())
-        vegas.append(bs.vega())
+    # Evaluate the Greeks over the whole price grid in one kernel call
+    deltas = np.empty_like(price_range)
+    gammas = np.empty_like(price_range)
+    thetas = np.empty_like(price_range)
+    vegas = np.empty_like(price_range)
+    bs_greeks_array(price_range, float(K), float(T), float(r), float(sigma),
+                    option_type.lower() == 'call', deltas, gammas, thetas, vegas)
     
     fig = go.Figure()
     
@@ -257,6 +260,46 @@ def create_greeks_chart(S, K, T, r, sigma, option_type):
     
     return fig
 
+@st.cache_data
+def payoff_diagram_dict(S, K, option_price, option_type, current_price):
+    """
+    Payoff diagram as a cached plain dict
+    
+    Reruns skip the trace/layout construction, but st.plotly_chart still
+    rebuilds and validates a Figure from the dict on every render.
+    """
+    return create_payoff_diagram(S, K, option_price, option_type, current_price).to_dict()
+
+@st.cache_data
+def greeks_chart_dict(S, K, T, r, sigma, option_type):
+    """Greeks chart as a cached plain dict (see payoff_diagram_dict)"""
+    return create_greeks_chart(S, K, T, r, sigma, option_type).to_dict()
+
+# Upper bound on chain rows, keeping the cached table and browser payload small
+MAX_CHAIN_STRIKES = 500
+
+def min_strike_step(S):
+    """Smallest strike step (rounded up to a cent) that stays within MAX_CHAIN_STRIKES"""
+    return max(ceil(S / (MAX_CHAIN_STRIKES - 1) * 100) / 100, 0.01)
+
+@st.cache_data
+def create_chain_table(S, T, r, sigma, option_type, step):
+    """Price an option chain with strikes stepping from 50% up to 150% of the stock price"""
+    step = max(step, min_strike_step(S))
+    # Half a step of slack keeps a strike landing on 150% despite float rounding
+    strikes = np.arange(S * 0.5, S * 1.5 + step / 2, step)[:MAX_CHAIN_STRIKES]
+    chain = bs_chain(S, strikes, T, r, sigma, option_type.lower() == 'call')
+    
+    return pd.DataFrame({
+        'Strike': strikes,
+        'Price': chain['price'],
+        'Delta': chain['delta'],
+        'Gamma': chain['gamma'],
+        'Theta': chain['theta'],
+        'Vega': chain['vega'],
+        'Rho': chain['rho']
+    })
+
 def main():
     # Header
     st.title("📈 OptiPrice - Black-Scholes Option Pricing Calculator")
@@ -276,14 +319,15 @@ def main():
     if st.sidebar.button("📊 Fetch Stock Data", type="primary"):
         if ticker:
             with st.spinner(f"Fetching data for {ticker}..."):
-                current_price, volatility, stock_info = get_stock_data(ticker)
+                current_price, volatility, stock_info, hist_3mo = get_stock_data(ticker)
                 
                 if current_price is not None:
                     st.session_state['stock_data'] = {
                         'ticker': ticker,
                         'current_price': current_price,
                         'volatility': volatility,
-                        'stock_info': stock_info
+                        'stock_info': stock_info,
+                        'hist_3mo': hist_3mo
                     }
                     st.sidebar.success("✅ Data fetched successfully!")
                 else:
@@ -370,26 +414,23 @@ def main():
     # Calculate option price and Greeks
     time_to_expiry = days_to_expiry / 365.0
     
-    bs_calc = BlackScholesCalculator(
-        S=current_price,
-        K=strike_price,
-        T=time_to_expiry,
-        r=risk_free_rate,
-        sigma=volatility,
-        option_type=option_type.lower()
+    # Round inputs so reruns with unchanged parameters hit the cache
+    option_price, delta, gamma, theta, vega, rho = _bs_all(
+        round(float(current_price), 6),
+        round(float(strike_price), 6),
+        round(time_to_expiry, 6),
+        round(risk_free_rate, 6),
+        round(float(volatility), 6),
+        option_type == "Call"
     )
     
-    option_price = bs_calc.option_price()
-    delta = bs_calc.delta()
-    gamma = bs_calc.gamma()
-    theta = bs_calc.theta()
-    vega = bs_calc.vega()
-    rho = bs_calc.rho()
-    
     # Main results
     st.header("📊 Option Pricing Results")
     
     # Option price and key metrics
+    # Distance into the money: positive when ITM for either option type
+    signed_moneyness = (1.0 if option_type == "Call" else -1.0) * (current_price - strike_price)
+    
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric(
@@ -398,12 +439,10 @@ def main():
             help="Black-Scholes theoretical option price"
         )
     with col2:
-        moneyness = "ITM" if (option_type == "Call" and current_price > strike_price) or (option_type == "Put" and current_price < strike_price) else "OTM"
-        if abs(current_price - strike_price) / current_price < 0.02:
-            moneyness = "ATM"
+        moneyness = "ATM" if abs(signed_moneyness) / current_price < 0.02 else ("ITM" if signed_moneyness > 0 else "OTM")
         st.metric("Moneyness", moneyness)
     with col3:
-        intrinsic = max(0, current_price - strike_price) if option_type == "Call" else max(0, strike_price - current_price)
+        intrinsic = max(0.0, signed_moneyness)
         time_value = option_price - intrinsic
         st.metric("Time Value", f"${time_value:.2f}")
     
@@ -425,46 +464,70 @@ def main():
     # Visualizations
     st.header("📈 Visualizations")
     
-    tab1, tab2, tab3 = st.tabs(["Payoff Diagram", "Greeks Chart", "Price History"])
+    tab1, tab2, tab3, tab4 = st.tabs(["Payoff Diagram", "Greeks Chart", "Price History", "Chain Pricer"])
     
     with tab1:
-        payoff_fig = create_payoff_diagram(current_price, strike_price, option_price, option_type, current_price)
+        payoff_fig = payoff_diagram_dict(
+            round(float(current_price), 4), round(float(strike_price), 4),
+            round(option_price, 4), option_type, round(float(current_price), 4)
+        )
         st.plotly_chart(payoff_fig, use_container_width=True)
     
     with tab2:
-        greeks_fig = create_greeks_chart(current_price, strike_price, time_to_expiry, risk_free_rate, volatility, option_type.lower())
+        greeks_fig = greeks_chart_dict(
+            round(float(current_price), 4), round(float(strike_price), 4),
+            time_to_expiry, risk_free_rate, round(float(volatility), 4),
+            option_type.lower()
+        )
         st.plotly_chart(greeks_fig, use_container_width=True)
     
     with tab3:
-        # Stock price history
-        with st.spinner("Loading price history..."):
-            stock = yf.Ticker(ticker)
-            hist_data = stock.history(period='3mo')
+        # Stock price history, reusing the frame fetched with the stock data
+        hist_data = stock_data['hist_3mo']
+        
+        if not hist_data.empty:
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=hist_data.index,
+                y=hist_data['Close'],
+                mode='lines',
+                name='Stock Price',
+                line=dict(color='blue')
+            ))
             
-            if not hist_data.empty:
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=hist_data.index,
-                    y=hist_data['Close'],
-                    mode='lines',
-                    name='Stock Price',
-                    line=dict(color='blue')
-                ))
-                
-                # Add strike price line
-                fig.add_hline(y=strike_price, line_dash="dash", line_color="red",
-                             annotation_text=f"Strike: ${strike_price:.2f}")
-                
-                fig.update_layout(
-                    title=f'{ticker} Price History (3 Months)',
-                    xaxis_title='Date',
-                    yaxis_title='Price ($)',
-                    height=400
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.error("Could not load price history")
+            # Add strike price line
+            fig.add_hline(y=strike_price, line_dash="dash", line_color="red",
+                         annotation_text=f"Strike: ${strike_price:.2f}")
+            
+            fig.update_layout(
+                title=f'{stock_data["ticker"]} Price History (3 Months)',
+                xaxis_title='Date',
+                yaxis_title='Price ($)',
+                height=400
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.error("Could not load price history")
+    
+    with tab4:
+        # Whole strike grid priced in a single vectorized call
+        strike_step = st.number_input(
+            "Strike Step ($)",
+            min_value=min_strike_step(current_price),
+            value=float(max(round(current_price * 0.05, 2), min_strike_step(current_price))),
+            step=0.01,
+            help=f"Spacing between strikes in the chain (at most {MAX_CHAIN_STRIKES} strikes)"
+        )
+        chain_df = create_chain_table(current_price, time_to_expiry, risk_free_rate, volatility, option_type, strike_step)
+        st.dataframe(
+            chain_df.style.format({
+                'Strike': '${:.2f}', 'Price': '${:.2f}', 'Delta': '{:.4f}', 'Gamma': '{:.4f}',
+                'Theta': '${:.4f}', 'Vega': '${:.4f}', 'Rho': '${:.4f}'
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
     
     # Summary table
     st.header("📋 Summary")
@@ -0,0 +1,244 @@
+"""
+Black-Scholes pricing kernels operating on plain floats and arrays
+
+The price-grid Greeks kernel is JIT-compiled with Numba when it is
+available. If Numba is missing, fails to import (e.g. an llvmlite version
+mismatch) or NUMBA_DISABLE_JIT is set, an equivalent numpy implementation
+is used. Likewise bs_all uses the _bs_ckernel C extension when it has been
+built (see setup.py) and the pure Python version otherwise.
+"""
+import math
+import os
+
+import numpy as np
+from scipy.special import ndtr
+
+try:
+    if os.environ.get('NUMBA_DISABLE_JIT', '0') not in ('', '0'):
+        raise ImportError("Numba JIT disabled via NUMBA_DISABLE_JIT")
+    from numba import njit
+    HAVE_NUMBA = True
+except Exception:
+    HAVE_NUMBA = False
+
+try:
+    from _bs_ckernel import bs_all as _c_bs_all
+    HAVE_C_KERNEL = True
+except ImportError:
+    HAVE_C_KERNEL = False
+
+# Normalising constant of the standard normal pdf
+SQRT_2PI = math.sqrt(2 * math.pi)
+
+
+def _norm_cdf(x):
+    """Standard normal CDF (Abramowitz & Stegun 26.2.17, abs. error < 7.5e-8)"""
+    t = 1.0 / (1.0 + 0.2316419 * abs(x))
+    y = t * (0.319381530 + t * (-0.356563782 + t * (1.781477937 + t * (-1.821255978 + t * 1.330274429))))
+    tail = y * math.exp(-0.5 * x * x) / SQRT_2PI
+    return 1.0 - tail if x >= 0 else tail
+
+
+def bs_terms(S, K, T, r, sigma):
+    """
+    Subexpressions shared by the Black-Scholes price and Greeks
+    
+    Only valid for T > 0 and sigma > 0.
+    
+    Returns:
+        tuple: (d1, d2, N(d1), N(d2), n(d1), exp(-rT), sqrt(T))
+    """
+    sqrtT = math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrtT)
+    d2 = d1 - sigma * sqrtT
+    nd1 = math.exp(-0.5 * d1 * d1) / SQRT_2PI
+    return d1, d2, ndtr(d1), ndtr(d2), nd1, math.exp(-r * T), sqrtT
+
+
+def bs_price(S, K, T, r, sigma, is_call, terms=None):
+    """
+    Black-Scholes price of a European option
+    
+    Args:
+        S (float): Current stock price
+        K (float): Strike price
+        T (float): Time to expiration (in years)
+        r (float): Risk-free rate
+        sigma (float): Volatility (annualized)
+        is_call (bool): True for a call, False for a put
+        terms (tuple): Precomputed bs_terms(S, K, T, r, sigma), optional
+    """
+    if T <= 0 or sigma <= 0:
+        return max(0.0, S - K) if is_call else max(0.0, K - S)
+
+    _, _, Nd1, Nd2, _, disc, _ = terms or bs_terms(S, K, T, r, sigma)
+    if is_call:
+        return S * Nd1 - K * disc * Nd2
+    return K * disc * (1 - Nd2) - S * (1 - Nd1)
+
+
+def bs_greeks(S, K, T, r, sigma, is_call, terms=None):
+    """
+    Black-Scholes Greeks of a European option
+    
+    Takes the same arguments as bs_price.
+    
+    Returns:
+        tuple: (delta, gamma, theta, vega, rho) with Theta per day and
+        Vega/Rho per 1% change
+    """
+    if T <= 0 or sigma <= 0:
+        if is_call:
+            delta = 1.0 if S > K else 0.0
+        else:
+            delta = -1.0 if S < K else 0.0
+        return delta, 0.0, 0.0, 0.0, 0.0
+
+    _, _, Nd1, Nd2, nd1, disc, sqrtT = terms or bs_terms(S, K, T, r, sigma)
+    gamma = nd1 / (S * sigma * sqrtT)
+    vega = S * nd1 * sqrtT / 100
+    decay = -(S * nd1 * sigma) / (2 * sqrtT)
+    if is_call:
+        delta = Nd1
+        theta = (decay - r * K * disc * Nd2) / 365
+        rho = K * T * disc * Nd2 / 100
+    else:
+        delta = Nd1 - 1
+        theta = (decay + r * K * disc * (1 - Nd2)) / 365
+        rho = -K * T * disc * (1 - Nd2) / 100
+    return delta, gamma, theta, vega, rho
+
+
+def _bs_all_python(S, K, T, r, sigma, is_call):
+    """
+    Black-Scholes price and Greeks in one pass
+    
+    Returns:
+        tuple: (price, delta, gamma, theta, vega, rho)
+    """
+    terms = bs_terms(S, K, T, r, sigma) if T > 0 and sigma > 0 else None
+    return (bs_price(S, K, T, r, sigma, is_call, terms),) + bs_greeks(S, K, T, r, sigma, is_call, terms)
+
+
+def bs_chain(S, K, T, r, sigma, is_call):
+    """
+    Black-Scholes price and Greeks for a whole option chain at one expiry
+    
+    Args:
+        S (float): Current stock price
+        K (array-like): Strike prices
+        T (float): Time to expiration (in years)
+        r (float): Risk-free rate
+        sigma (float): Volatility (annualized)
+        is_call (bool or array-like): Call/put flag, broadcast against K
+    
+    Returns:
+        dict: 'price', 'delta', 'gamma', 'theta', 'vega' and 'rho' arrays,
+        with the same units as bs_price and bs_greeks
+    """
+    K = np.asarray(K, dtype=float)
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), K.shape)
+
+    if T <= 0 or sigma <= 0:
+        return {
+            'price': np.where(is_call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0)),
+            'delta': np.where(is_call, np.where(S > K, 1.0, 0.0), np.where(S < K, -1.0, 0.0)),
+            'gamma': np.zeros_like(K),
+            'theta': np.zeros_like(K),
+            'vega': np.zeros_like(K),
+            'rho': np.zeros_like(K),
+        }
+
+    sqrtT = math.sqrt(T)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrtT)
+    d2 = d1 - sigma * sqrtT
+    Nd1 = ndtr(d1)
+    Nd2 = ndtr(d2)
+    nd1 = np.exp(-0.5 * d1 * d1) / SQRT_2PI
+    Kdisc = K * math.exp(-r * T)
+
+    return {
+        'price': np.where(is_call, S * Nd1 - Kdisc * Nd2, Kdisc * (1 - Nd2) - S * (1 - Nd1)),
+        'delta': np.where(is_call, Nd1, Nd1 - 1),
+        'gamma': nd1 / (S * sigma * sqrtT),
+        'theta': (-(S * nd1 * sigma) / (2 * sqrtT)
+                  + np.where(is_call, -r * Kdisc * Nd2, r * Kdisc * (1 - Nd2))) / 365,
+        'vega': S * nd1 * sqrtT / 100,
+        'rho': np.where(is_call, Kdisc * T * Nd2, -Kdisc * T * (1 - Nd2)) / 100,
+    }
+
+
+def _bs_greeks_loop(S_arr, K, T, r, sigma, is_call, out_delta, out_gamma, out_theta, out_vega):
+    """Fill Delta, Gamma, Theta (per day) and Vega (per 1% vol) for each price in S_arr"""
+    n = S_arr.shape[0]
+
+    if T <= 0 or sigma <= 0:
+        # At expiry only Delta is non-zero, as a step at the strike
+        for i in range(n):
+            if is_call:
+                out_delta[i] = 1.0 if S_arr[i] > K else 0.0
+            else:
+                out_delta[i] = -1.0 if S_arr[i] < K else 0.0
+            out_gamma[i] = 0.0
+            out_theta[i] = 0.0
+            out_vega[i] = 0.0
+        return
+
+    sqrtT = math.sqrt(T)
+    sig_sqrtT = sigma * sqrtT
+    drift = (r + 0.5 * sigma * sigma) * T
+    rKdisc = r * K * math.exp(-r * T)
+
+    for i in range(n):
+        S = S_arr[i]
+        d1 = (math.log(S / K) + drift) / sig_sqrtT
+        d2 = d1 - sig_sqrtT
+        nd1 = math.exp(-0.5 * d1 * d1) / SQRT_2PI
+
+        if is_call:
+            out_delta[i] = norm_cdf(d1)
+            out_theta[i] = (-(S * nd1 * sigma) / (2 * sqrtT) - rKdisc * norm_cdf(d2)) / 365
+        else:
+            out_delta[i] = norm_cdf(d1) - 1
+            out_theta[i] = (-(S * nd1 * sigma) / (2 * sqrtT) + rKdisc * norm_cdf(-d2)) / 365
+        out_gamma[i] = nd1 / (S * sig_sqrtT)
+        out_vega[i] = S * nd1 * sqrtT / 100
+
+
+def _bs_greeks_numpy(S_arr, K, T, r, sigma, is_call, out_delta, out_gamma, out_theta, out_vega):
+    """Fill Delta, Gamma, Theta (per day) and Vega (per 1% vol) for each price in S_arr"""
+    if T <= 0 or sigma <= 0:
+        # At expiry only Delta is non-zero, as a step at the strike
+        if is_call:
+            out_delta[:] = np.where(S_arr > K, 1.0, 0.0)
+        else:
+            out_delta[:] = np.where(S_arr < K, -1.0, 0.0)
+        out_gamma[:] = 0.0
+        out_theta[:] = 0.0
+        out_vega[:] = 0.0
+        return
+
+    sqrtT = math.sqrt(T)
+    d1 = (np.log(S_arr / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrtT)
+    d2 = d1 - sigma * sqrtT
+    nd1 = np.exp(-0.5 * d1 * d1) / SQRT_2PI
+    disc = math.exp(-r * T)
+
+    if is_call:
+        out_delta[:] = ndtr(d1)
+        out_theta[:] = (-(S_arr * nd1 * sigma) / (2 * sqrtT) - r * K * disc * ndtr(d2)) / 365
+    else:
+        out_delta[:] = ndtr(d1) - 1
+        out_theta[:] = (-(S_arr * nd1 * sigma) / (2 * sqrtT) + r * K * disc * ndtr(-d2)) / 365
+    out_gamma[:] = nd1 / (S_arr * sigma * sqrtT)
+    out_vega[:] = S_arr * nd1 * sqrtT / 100
+
+
+if HAVE_NUMBA:
+    norm_cdf = njit(cache=True, fastmath=True)(_norm_cdf)
+    bs_greeks_array = njit(cache=True, fastmath=True)(_bs_greeks_loop)
+else:
+    norm_cdf = ndtr
+    bs_greeks_array = _bs_greeks_numpy
+
+bs_all = _c_bs_all if HAVE_C_KERNEL else _bs_all_python
@@ -0,0 +1,33 @@
+"""
+Build the optional compiled Black-Scholes kernel
+
+    python setup.py build_ext --inplace
+
+The app falls back to the pure Python kernel when the extension is not built.
+"""
+from setuptools import setup, Extension
+from setuptools.command.build_ext import build_ext
+from Cython.Build import cythonize
+
+# Optimisation flags per compiler family
+COMPILE_ARGS = {
+    'msvc': ['/O2', '/fp:fast'],
+    'unix': ['-O3', '-ffast-math', '-march=native'],
+}
+
+
+class OptimizedBuildExt(build_ext):
+    """build_ext that picks optimisation flags matching the active compiler"""
+
+    def build_extensions(self):
+        args = COMPILE_ARGS.get(self.compiler.compiler_type, COMPILE_ARGS['unix'])
+        for ext in self.extensions:
+            ext.extra_compile_args = args
+        super().build_extensions()
+
+
+setup(
+    name='optiprice-kernel',
+    ext_modules=cythonize([Extension('_bs_ckernel', ['_bs_ckernel.pyx'])]),
+    cmdclass={'build_ext': OptimizedBuildExt},
+)
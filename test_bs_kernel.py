@@ -0,0 +1,107 @@
+"""Tests for bs_kernel against scipy references"""
+import numpy as np
+import pytest
+from scipy.special import ndtr
+from scipy.stats import norm
+
+import bs_kernel
+
+try:
+    import _bs_ckernel
+except ImportError:
+    _bs_ckernel = None
+
+
+def reference_bs(S, K, T, r, sigma, is_call):
+    """Textbook Black-Scholes price and Greeks using scipy.stats.norm"""
+    if T <= 0 or sigma <= 0:
+        if is_call:
+            return max(0.0, S - K), (1.0 if S > K else 0.0), 0.0, 0.0, 0.0, 0.0
+        return max(0.0, K - S), (-1.0 if S < K else 0.0), 0.0, 0.0, 0.0, 0.0
+
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+    disc = np.exp(-r * T)
+    gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
+    vega = S * norm.pdf(d1) * np.sqrt(T) / 100
+    decay = -(S * norm.pdf(d1) * sigma) / (2 * np.sqrt(T))
+    if is_call:
+        price = S * norm.cdf(d1) - K * disc * norm.cdf(d2)
+        delta = norm.cdf(d1)
+        theta = (decay - r * K * disc * norm.cdf(d2)) / 365
+        rho = K * T * disc * norm.cdf(d2) / 100
+    else:
+        price = K * disc * norm.cdf(-d2) - S * norm.cdf(-d1)
+        delta = norm.cdf(d1) - 1
+        theta = (decay + r * K * disc * norm.cdf(-d2)) / 365
+        rho = -K * T * disc * norm.cdf(-d2) / 100
+    return price, delta, gamma, theta, vega, rho
+
+
+# Without Numba the JIT entry points are the scipy/numpy fallbacks themselves
+requires_numba = pytest.mark.skipif(not bs_kernel.HAVE_NUMBA, reason="Numba JIT unavailable")
+
+# Both bs_all implementations, whichever one bs_kernel.bs_all is bound to
+BS_ALL_IMPLS = [
+    pytest.param(bs_kernel._bs_all_python, id='python'),
+    pytest.param(getattr(_bs_ckernel, 'bs_all', None), id='cython',
+                 marks=pytest.mark.skipif(_bs_ckernel is None, reason="_bs_ckernel extension not built")),
+]
+
+CASES = [
+    (100.0, 100.0, 0.25, 0.03, 0.2),
+    (100.0, 80.0, 1.0, 0.05, 0.4),
+    (50.0, 70.0, 2 / 365, 0.0, 0.8),
+    (150.0, 120.0, 0.0, 0.03, 0.2),
+    (100.0, 110.0, 0.5, 0.03, 0.0),
+]
+
+
+def test_norm_cdf_matches_scipy():
+    # The pure Python approximation, so it is checked even without Numba
+    xs = np.linspace(-4, 4, 8001)
+    values = np.array([bs_kernel._norm_cdf(x) for x in xs])
+    np.testing.assert_allclose(values, ndtr(xs), rtol=0, atol=1e-6)
+
+
+@requires_numba
+def test_jit_norm_cdf_matches_scipy():
+    xs = np.linspace(-4, 4, 8001)
+    values = np.array([bs_kernel.norm_cdf(x) for x in xs])
+    np.testing.assert_allclose(values, ndtr(xs), rtol=0, atol=1e-6)
+
+
+@requires_numba
+@pytest.mark.parametrize('is_call', [True, False])
+@pytest.mark.parametrize('T, sigma', [(0.25, 0.2), (2.0, 0.6), (0.0, 0.2)])
+def test_bs_greeks_array_matches_numpy_fallback(is_call, T, sigma):
+    S = np.linspace(80, 120, 50)
+    kernel = [np.empty_like(S) for _ in range(4)]
+    fallback = [np.empty_like(S) for _ in range(4)]
+    bs_kernel.bs_greeks_array(S, 100.0, T, 0.03, sigma, is_call, *kernel)
+    bs_kernel._bs_greeks_numpy(S, 100.0, T, 0.03, sigma, is_call, *fallback)
+    for got, expected in zip(kernel, fallback):
+        np.testing.assert_allclose(got, expected, rtol=0, atol=1e-6)
+
+
+@pytest.mark.parametrize('bs_all', BS_ALL_IMPLS)
+@pytest.mark.parametrize('is_call', [True, False])
+@pytest.mark.parametrize('S, K, T, r, sigma', CASES)
+def test_bs_all_matches_reference(bs_all, S, K, T, r, sigma, is_call):
+    np.testing.assert_allclose(
+        bs_all(S, K, T, r, sigma, is_call),
+        reference_bs(S, K, T, r, sigma, is_call),
+        rtol=0, atol=1e-10
+    )
+
+
+@pytest.mark.parametrize('T, sigma', [(0.25, 0.2), (0.0, 0.2)])
+def test_bs_chain_matches_reference(T, sigma):
+    strikes = np.linspace(50, 150, 21)
+    is_call = np.arange(strikes.size) % 2 == 0
+    chain = bs_kernel.bs_chain(100.0, strikes, T, 0.03, sigma, is_call)
+    names = ['price', 'delta', 'gamma', 'theta', 'vega', 'rho']
+    for i, (K, call) in enumerate(zip(strikes, is_call)):
+        expected = reference_bs(100.0, K, T, 0.03, sigma, bool(call))
+        got = [chain[name][i] for name in names]
+        np.testing.assert_allclose(got, expected, rtol=0, atol=1e-10)